@@ -1,5 +1,7 @@
 from .version import *
 from .downtimeModel import *
 from .downtimeModelConfig import *
+from .downtimeData import *
 from .scheduledDowntimeData import *
 from .unscheduledDowntimeData import *
+from .downtimeSweep import *
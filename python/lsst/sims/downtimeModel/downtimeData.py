@@ -0,0 +1,172 @@
+from builtins import object
+from functools import lru_cache
+import sys
+import numpy as np
+from astropy.time import Time, TimeDelta
+
+
+__all__ = ['DowntimeData']
+
+
+@lru_cache(maxsize=64)
+def _shared_night0(year_start, start_of_night_offset):
+    """Return the (shared, read-only) astropy.time.Time of the start of the first night of year_start."""
+    night0 = Time('%d-01-01' % year_start, format='isot', scale='tai') + start_of_night_offset
+    night0.writeable = False
+    return night0
+
+
+def _time_nbytes(time):
+    """Return the (approximate) memory footprint (bytes) of a scalar astropy.time.Time."""
+    return (sys.getsizeof(time) + sys.getsizeof(vars(time)) + sys.getsizeof(time._time) +
+            sys.getsizeof(vars(time._time)) + sys.getsizeof(time.jd1) + sys.getsizeof(time.jd2))
+
+
+class DowntimeData(object):
+    """Base class for the scheduled and unscheduled downtime data.
+
+    The downtimes are stored compactly: the start night of each downtime (relative to night0),
+    its length in days and an index into a tuple of (interned) activity labels. night0 is shared
+    between all instances with the same year and offset; it is read-only and must not be modified
+    in any other way (e.g. by changing its format) either.
+    The np.ndarray of start / end / activity (as returned by __call__) is built from these when first
+    requested and kept until release_downtime is called (or the downtimes are recreated). It holds
+    two astropy.time.Time per downtime, so use starts and ends where possible.
+
+    Parameters
+    ----------
+    start_time : astropy.time.Time
+        The time of the start of the simulation.
+        The downtimes will be assumed to start on Jan 01 of the same year.
+    start_of_night_offset : float
+        The fraction of a day to offset from MJD.0 to reach the defined start of a night.
+    """
+    __slots__ = ('_night0', '_nights', '_lengths', '_activity_codes', '_activities', '_downtime')
+
+    def __init__(self, start_time, start_of_night_offset):
+        self._night0 = _shared_night0(start_time.datetime.year, start_of_night_offset)
+        self._set_downtime([], [], [])
+
+    @property
+    def night0(self):
+        """astropy.time.Time of the start of the first night of the downtimes (shared, read-only)."""
+        return self._night0
+
+    def _set_downtime(self, nights, lengths, acts):
+        """Store the downtimes.
+
+        Parameters
+        ----------
+        nights : np.ndarray
+            The night (from night0) each downtime starts.
+        lengths : np.ndarray
+            The length (days) of each downtime.
+        acts : list of str
+            The activity of each downtime.
+        """
+        index = {}
+        codes = [index.setdefault(act, len(index)) for act in acts]
+        self._activities = tuple(sys.intern(act) if isinstance(act, str) else act for act in index)
+        self._activity_codes = np.array(codes, dtype=np.min_scalar_type(len(self._activities)))
+        self._nights = np.array(nights, dtype=np.int32)
+        self._lengths = np.array(lengths, dtype=np.int32)
+        self._downtime = None
+
+    @property
+    def starts(self):
+        """astropy.time.Time array of the start of each downtime."""
+        return self.night0 + TimeDelta(self._nights, format='jd')
+
+    @property
+    def ends(self):
+        """astropy.time.Time array of the end of each downtime."""
+        return self.starts + TimeDelta(self._lengths, format='jd')
+
+    @property
+    def downtime(self):
+        """np.ndarray of the downtimes, with keys for 'start', 'end', 'activity',
+        corresponding to astropy.time.Time, astropy.time.Time, and str.
+
+        This array (of two astropy.time.Time objects per downtime) is built on first access and kept
+        until release_downtime is called.
+        """
+        if self._downtime is None:
+            self._downtime = self._rows(slice(None))
+        return self._downtime
+
+    def release_downtime(self):
+        """Release the np.ndarray of downtimes, keeping only the compact representation.
+
+        Any changes made to that array are lost; the next access of downtime builds it afresh.
+        """
+        self._downtime = None
+
+    def _rows(self, index):
+        """Build the np.ndarray of downtimes (see downtime) for the downtimes selected by index."""
+        starts = self.night0 + TimeDelta(self._nights[index], format='jd')
+        ends = starts + TimeDelta(self._lengths[index], format='jd')
+        acts = [self._activities[code] for code in self._activity_codes[index]]
+        return np.array(list(zip(starts, ends, acts)),
+                        dtype=[('start', 'O'), ('end', 'O'), ('activity', 'O')])
+
+    @property
+    def nbytes(self):
+        """The memory footprint (bytes) of this instance.
+
+        This counts the instance and the values it holds, including (approximately) the np.ndarray of
+        downtimes while it is kept, but not night0 or the (interned) activity label strings,
+        which are shared between instances.
+        """
+        shared = ('_night0',)
+        nbytes = sys.getsizeof(self)
+        for cls in type(self).__mro__:
+            for name in getattr(cls, '__slots__', ()):
+                if name not in shared:
+                    nbytes += sys.getsizeof(getattr(self, name))
+        if self._downtime is not None:
+            for row in self._downtime:
+                nbytes += _time_nbytes(row['start']) + _time_nbytes(row['end'])
+        return nbytes
+
+    def __call__(self):
+        """Return the array of downtimes.
+
+        Returns
+        -------
+        np.ndarray
+            The array of all downtimes, with keys for 'start', 'end', 'activity',
+            corresponding to astropy.time.Time, astropy.time.Time, and str.
+        """
+        return self.downtime
+
+    def _downtimeStatus(self, time):
+        """Look behind the scenes at the downtime status/next values
+        """
+        if self._downtime is not None:
+            # Use (and reflect any changes to) the np.ndarray of downtimes while it is kept.
+            next_start = self._downtime['start'].searchsorted(time, side='right')
+            next_end = self._downtime['end'].searchsorted(time, side='right')
+            if next_start > next_end:
+                current = self._downtime[next_end]
+            else:
+                current = None
+            return current, self._downtime[next_start:]
+        night = (time - self.night0).jd
+        next_start = self._nights.searchsorted(night, side='right')
+        next_end = (self._nights + self._lengths).searchsorted(night, side='right')
+        if next_start > next_end:
+            current = self._rows([next_end])[0]
+        else:
+            current = None
+        future = self._rows(slice(next_start, None))
+        return current, future
+
+    def total_downtime(self):
+        """Return total downtime (in days).
+
+        Returns
+        -------
+        int
+            Total number of downtime days.
+        """
+        return int(self._lengths.sum())
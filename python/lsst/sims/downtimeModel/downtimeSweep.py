@@ -0,0 +1,245 @@
+from builtins import object
+from collections import OrderedDict
+from functools import partial
+import multiprocessing
+import random
+import numpy as np
+from astropy.time import Time
+from .scheduledDowntimeData import _default_scheduled_downtime_db, _read_scheduled_nights
+from .unscheduledDowntimeData import UnscheduledDowntimeData
+
+
+__all__ = ['DowntimeSweep']
+
+
+def _unscheduled_nights(seed, draw_length, legacy_rng=True):
+    """Draw the unscheduled downtime (nights, lengths) for one seed over draw_length nights.
+
+    With legacy_rng, uses a private random.Random, which reproduces the sequence of
+    UnscheduledDowntimeData.make_data without touching the global random state.
+    Either generator fills the nights in order, so the downtimes of the first survey_length nights
+    match those of UnscheduledDowntimeData for any draw_length >= survey_length.
+    """
+    if legacy_rng:
+        rng = random.Random(seed)
+    else:
+        rng = np.random.default_rng(seed)
+    nights, lengths, acts = UnscheduledDowntimeData._draw_events(rng, draw_length)
+    return nights, lengths, draw_length
+
+
+def _down_nights(nights, lengths, n_nights):
+    """Return a boolean array of the first n_nights nights, True where a downtime covers the night."""
+    change = np.zeros(n_nights + 1, dtype=int)
+    np.add.at(change, nights, 1)
+    np.add.at(change, nights + lengths, -1)
+    return np.cumsum(change[:-1]) > 0
+
+
+def _cumulative(down):
+    """Return the number of down nights before each night (last axis), including the night after the end."""
+    cumulative = np.zeros(down.shape[:-1] + (down.shape[-1] + 1,), dtype=np.int32)
+    np.cumsum(down, axis=-1, out=cumulative[..., 1:])
+    return cumulative
+
+
+def _window_downtime(cumulative, window_start, window_end):
+    """Return the downtime (days) within each [window_start, window_end), in days from night0.
+
+    cumulative has one row per seed (see _cumulative); the windows broadcast against the seeds.
+    Downtimes are whole nights, so the cumulative downtime is interpolated linearly within a night.
+    """
+    n_nights = cumulative.shape[-1] - 1
+    rows = np.arange(cumulative.shape[0])
+
+    def downtime_before(x):
+        x = np.clip(x, 0, n_nights)
+        night = np.minimum(np.floor(x).astype(int), max(n_nights - 1, 0))
+        lower = cumulative[rows, night]
+        upper = cumulative[rows, np.minimum(night + 1, n_nights)]
+        return lower + (upper - lower) * (x - night)
+
+    return downtime_before(window_end) - downtime_before(window_start)
+
+
+class DowntimeSweep(object):
+    """Evaluate downtime availability over a grid of survey start dates, night offsets and seeds.
+
+    ScheduledDowntimeData and UnscheduledDowntimeData derive night0 from the year of the survey start
+    and the start_of_night_offset. Here the scheduled calendar is read once and the unscheduled
+    downtimes are drawn once per seed, both as nights relative to night0; these are then rebased
+    onto every night0 of the grid by broadcasting.
+
+    Parameters
+    ----------
+    scheduled_downtime_db : str, opt
+        The full path name for the scheduled downtime database. Default None,
+        which will use the database stored in the module ($SIMS_DOWNTIMEMODEL_DIR/data/scheduled_downtime.db).
+    survey_length : int, opt
+        The (positive) number of nights in the total survey. Default 3650*2.
+    legacy_rng : bool, opt
+        Draw the unscheduled downtimes as UnscheduledDowntimeData does with legacy_rng. Default True.
+    """
+    def __init__(self, scheduled_downtime_db=None, survey_length=3650*2, legacy_rng=True):
+        if survey_length <= 0:
+            raise RuntimeError(f'Expecting a positive survey_length, got {survey_length!r}.')
+        self.scheduled_downtime_db = scheduled_downtime_db
+        if self.scheduled_downtime_db is None:
+            self.scheduled_downtime_db = _default_scheduled_downtime_db()
+        self.survey_length = survey_length
+        self.legacy_rng = legacy_rng
+        # The scheduled calendar, as nights relative to night0.
+        self.nights, self.durations, _ = _read_scheduled_nights(self.scheduled_downtime_db)
+        # Unscheduled downtimes (nights, lengths, nights drawn) relative to night0, keyed by seed.
+        self._unscheduled = {}
+
+    def night0_grid(self, start_times, start_of_night_offsets=-0.34):
+        """Calculate night0 (MJD, TAI) for each combination of start time and start of night offset.
+
+        Parameters
+        ----------
+        start_times : astropy.time.Time
+            The time (or times) of the start of the simulation.
+        start_of_night_offsets : float or np.ndarray, opt
+            The fraction(s) of a day to offset from MJD.0 to reach the defined start of a night.
+            Default -0.34.
+
+        Returns
+        -------
+        np.ndarray
+            night0 as MJD, with shape (len(start_times), len(start_of_night_offsets)).
+        """
+        years = [dt.year for dt in np.atleast_1d(start_times.datetime)]
+        year_starts = Time(['%d-01-01' % year for year in years], format='isot', scale='tai').mjd
+        offsets = np.atleast_1d(np.asarray(start_of_night_offsets, dtype=float))
+        return year_starts[:, np.newaxis] + offsets[np.newaxis, :]
+
+    @staticmethod
+    def rebase(night0, nights, lengths):
+        """Rebase downtimes relative to night0 onto one or many night0 values.
+
+        Parameters
+        ----------
+        night0 : float or np.ndarray
+            night0 value(s), as MJD.
+        nights : np.ndarray
+            The night (from night0) each downtime starts.
+        lengths : np.ndarray
+            The length (days) of each downtime.
+
+        Returns
+        -------
+        np.ndarray, np.ndarray
+            Start and end MJDs of each downtime, with shape night0.shape + (len(nights),).
+        """
+        night0 = np.asarray(night0, dtype=float)[..., np.newaxis]
+        starts = night0 + nights
+        return starts, starts + lengths
+
+    def scheduled(self, night0):
+        """Start and end MJDs of the scheduled downtimes, rebased onto night0 (see rebase)."""
+        return self.rebase(night0, self.nights, self.durations)
+
+    def unscheduled(self, night0, seed=1516231120):
+        """Start and end MJDs of the unscheduled downtimes for seed, rebased onto night0 (see rebase).
+
+        As in UnscheduledDowntimeData, these are the downtimes starting within survey_length nights of night0.
+        """
+        seed = int(seed)
+        self._draw([seed], self.survey_length)
+        nights, lengths, draw_length = self._unscheduled[seed]
+        in_survey = nights < self.survey_length
+        return self.rebase(night0, nights[in_survey], lengths[in_survey])
+
+    def _draw(self, seeds, draw_length, processes=None):
+        """Draw (and keep) the unscheduled downtimes over draw_length nights, for any seeds not yet
+        drawn over at least that many nights."""
+        seeds = [seed for seed in dict.fromkeys(seeds)
+                 if seed not in self._unscheduled or self._unscheduled[seed][2] < draw_length]
+        if len(seeds) == 0:
+            return
+        draw = partial(_unscheduled_nights, draw_length=draw_length, legacy_rng=self.legacy_rng)
+        if processes is None or processes == 1 or len(seeds) == 1:
+            results = [draw(seed) for seed in seeds]
+        else:
+            with multiprocessing.Pool(processes) as pool:
+                results = pool.map(draw, seeds)
+        for seed, result in zip(seeds, results):
+            self._unscheduled[seed] = result
+
+    def __call__(self, start_times, start_of_night_offsets=-0.34, seeds=(1516231120,), processes=None):
+        """Evaluate the downtime during the survey for each (start time, offset, seed) combination.
+
+        The survey runs for survey_length nights from the start time. The unscheduled downtimes
+        are drawn from night0 up to the end of the latest survey; those within the first
+        survey_length nights are the same as from UnscheduledDowntimeData.
+
+        Parameters
+        ----------
+        start_times : astropy.time.Time
+            The time (or times) of the start of the simulation.
+        start_of_night_offsets : float or np.ndarray, opt
+            The fraction(s) of a day to offset from MJD.0 to reach the defined start of a night.
+            Default -0.34.
+        seeds : list of int, opt
+            The random seeds for the unscheduled downtimes. Default (1516231120,).
+        processes : int, opt
+            The number of processes used to draw the unscheduled downtimes for new seeds.
+            Default None, which draws them in this process.
+
+        Returns
+        -------
+        OrderedDict of np.ndarray
+            The scheduled, unscheduled and total (either) downtime (days) within the survey and
+            the fraction of the survey available, each with shape (len(start_times),
+            len(start_of_night_offsets), len(seeds)).
+        """
+        seeds = [int(seed) for seed in np.atleast_1d(seeds)]
+        night0 = self.night0_grid(start_times, start_of_night_offsets)
+        # The survey window, in days from night0.
+        window_start = np.atleast_1d(start_times.tai.mjd)[:, np.newaxis] - night0
+        window_end = window_start + self.survey_length
+        draw_length = max(self.survey_length, int(np.ceil(window_end.max())))
+        self._draw(seeds, draw_length, processes=processes)
+
+        # Count the down nights from night0 for the scheduled downtimes, and for the unscheduled
+        # and total (either) downtimes of each seed; nights overlapping in both are counted once.
+        n_nights = int(max(self.nights + self.durations, default=0))
+        for seed in seeds:
+            nights, lengths, _ = self._unscheduled[seed]
+            if len(nights) > 0:
+                n_nights = max(n_nights, int(nights[-1] + lengths[-1]))
+        sched_down = _down_nights(self.nights, self.durations, n_nights)
+        unsched_down = np.zeros((len(seeds), n_nights), dtype=bool)
+        for i, seed in enumerate(seeds):
+            unsched_down[i] = _down_nights(*self._unscheduled[seed][:2], n_nights)
+        total_down = unsched_down | sched_down
+
+        # Look up each (start time, offset) window against every seed.
+        window_start = window_start[..., np.newaxis]
+        window_end = window_end[..., np.newaxis]
+        sched = _window_downtime(_cumulative(sched_down[np.newaxis, :]), window_start, window_end)
+        sched = np.broadcast_to(sched, window_start.shape[:2] + (len(seeds),))
+        unsched = _window_downtime(_cumulative(unsched_down), window_start, window_end)
+        total = _window_downtime(_cumulative(total_down), window_start, window_end)
+
+        metrics = OrderedDict()
+        metrics['scheduled_downtime'] = sched
+        metrics['unscheduled_downtime'] = unsched
+        metrics['total_downtime'] = total
+        metrics['available_fraction'] = 1 - total / self.survey_length
+        return metrics
+
+    def config_info(self):
+        """Report information about configuration of this sweep.
+
+        Returns
+        -------
+        OrderedDict
+        """
+        config_info = OrderedDict()
+        config_info['Scheduled downtime database'] = self.scheduled_downtime_db
+        config_info['Survey length (nights)'] = self.survey_length
+        config_info['Legacy RNG'] = self.legacy_rng
+        config_info['Seeds drawn'] = list(self._unscheduled.keys())
+        return config_info
@@ -1,16 +1,47 @@
-from builtins import object
 from collections import OrderedDict
 import os
 import sqlite3
 import numpy as np
-from astropy.time import Time, TimeDelta
 from lsst.utils import getPackageDir
+from .downtimeData import DowntimeData
 
 
 __all__ = ['ScheduledDowntimeData']
 
 
-class ScheduledDowntimeData(object):
+def _default_scheduled_downtime_db():
+    """Return the full path name of the scheduled downtime database stored in the module."""
+    return os.path.join(getPackageDir('sims_downtimeModel'), 'data', 'scheduled_downtime.db')
+
+
+def _read_scheduled_nights(scheduled_downtime_db):
+    """Read the scheduled downtime calendar as nights relative to the start of the simulation.
+
+    Parameters
+    ----------
+    scheduled_downtime_db : str
+        The full path name of the scheduled downtime database.
+
+    Returns
+    -------
+    np.ndarray, np.ndarray, list of str
+        The night (from night0) each downtime starts, its duration (days) and its activity.
+    """
+    nights = []
+    durations = []
+    acts = []
+    with sqlite3.connect(scheduled_downtime_db) as conn:
+        cur = conn.cursor()
+        cur.execute("select * from Downtime;")
+        for row in cur:
+            nights.append(int(row[0]))
+            durations.append(int(row[1]))
+            acts.append(row[2])
+        cur.close()
+    return np.array(nights, dtype=int), np.array(durations, dtype=int), acts
+
+
+class ScheduledDowntimeData(DowntimeData):
     """Read the scheduled downtime data.
 
     This class deals with the scheduled downtime information that was previously produced for
@@ -28,50 +59,19 @@ class ScheduledDowntimeData(object):
         The fraction of a day to offset from MJD.0 to reach the defined start of a night ('noon' works).
         Default 0.16 (UTC midnight in Chile) - 0.5 (minus half a day) = -0.34
     """
+    __slots__ = ('scheduled_downtime_db',)
+
     def __init__(self, start_time, scheduled_downtime_db=None, start_of_night_offset=-0.34):
         self.scheduled_downtime_db = scheduled_downtime_db
         if self.scheduled_downtime_db is None:
-            self.scheduled_downtime_db = os.path.join(getPackageDir('sims_downtimeModel'),
-                                                      'data', 'scheduled_downtime.db')
+            self.scheduled_downtime_db = _default_scheduled_downtime_db()
 
         # downtime database starts in Jan 01 of the year of the start of the simulation.
-        year_start = start_time.datetime.year
-        self.night0 = Time('%d-01-01' % year_start, format='isot', scale='tai') + start_of_night_offset
-
-        # Scheduled downtime data is a np.ndarray of start / end / activity for each scheduled downtime.
-        self.downtime = None
+        super().__init__(start_time, start_of_night_offset)
         self.read_data()
 
-    def __call__(self):
-        """Return the current (if any) and any future scheduled downtimes.
-
-        Parameters
-        ----------
-        time : astropy.time.Time
-            Time in the simulation for which to find the current downtime.
-
-        Returns
-        -------
-        np.ndarray
-            The array of all unscheduled downtimes, with keys for 'start', 'end', 'activity',
-            corresponding to astropy.time.Time, astropy.time.Time, and str.
-        """
-        return self.downtime
-
-    def _downtimeStatus(self, time):
-        """Look behind the scenes at the downtime status/next values
-        """
-        next_start = self.downtime['start'].searchsorted(time, side='right')
-        next_end = self.downtime['end'].searchsorted(time, side='right')
-        if next_start > next_end:
-            current = self.downtime[next_end]
-        else:
-            current = None
-        future = self.downtime[next_start:]
-        return current, future
-
     def read_data(self):
-        """Read the scheduled downtime information from disk and translate to astropy.time.Times.
+        """Read the scheduled downtime information from disk.
 
         This function gets the appropriate database file and creates the set of
         scheduled downtimes from it. The default behavior is to use the module stored
@@ -85,25 +85,7 @@ class ScheduledDowntimeData(object):
         activity
             str : A description of the activity involved.
         """
-        # Read from database.
-        starts = []
-        ends = []
-        acts = []
-        with sqlite3.connect(self.scheduled_downtime_db) as conn:
-            cur = conn.cursor()
-            cur.execute("select * from Downtime;")
-            for row in cur:
-                start_night = int(row[0])
-                start_night = self.night0 + TimeDelta(start_night, format='jd')
-                n_down = int(row[1])
-                end_night = start_night + TimeDelta(n_down)
-                activity = row[2]
-                starts.append(start_night)
-                ends.append(end_night)
-                acts.append(activity)
-            cur.close()
-        self.downtime = np.array(list(zip(starts, ends, acts)),
-                                 dtype=[('start', 'O'), ('end', 'O'), ('activity', 'O')])
+        self._set_downtime(*_read_scheduled_nights(self.scheduled_downtime_db))
 
     def config_info(self):
         """Report information about configuration of this data.
@@ -114,20 +96,8 @@ class ScheduledDowntimeData(object):
         """
         config_info = OrderedDict()
         config_info['Survey start'] = self.night0.isot
-        config_info['Last scheduled downtime ends'] = self.downtime['end'][-1].isot
+        config_info['Last scheduled downtime ends'] = self.ends[-1].isot
         config_info['Total scheduled downtime (days)'] = self.total_downtime()
+        config_info['Memory footprint (bytes)'] = self.nbytes
         config_info['Scheduled Downtimes'] = self.downtime
         return config_info
-
-    def total_downtime(self):
-        """Return total downtime (in days).
-
-        Returns
-        -------
-        int
-            Total number of downtime days.
-        """
-        total = 0
-        for td in (self.downtime['end'] - self.downtime['start']):
-            total += td.jd
-        return total
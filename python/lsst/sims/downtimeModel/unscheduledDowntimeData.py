@@ -1,14 +1,14 @@
-from builtins import object
 from collections import OrderedDict
 import numpy as np
-from astropy.time import Time, TimeDelta
+from astropy.time import TimeDelta
 import random
+from .downtimeData import DowntimeData
 
 
 __all__ = ['UnscheduledDowntimeData']
 
 
-class UnscheduledDowntimeData(object):
+class UnscheduledDowntimeData(DowntimeData):
     """Handle (and create) the unscheduled downtime information.
 
     Parameters
@@ -23,6 +23,10 @@ class UnscheduledDowntimeData(object):
         Default 0.16 (UTC midnight in Chile) - 0.5 (minus half a day) = -0.34
     survey_length : int, opt
         The number of nights in the total survey. Default 3650*2.
+    legacy_rng : bool, opt
+        If True, draw the downtimes with the (globally seeded) python random module, reproducing
+        the downtimes of earlier simulations. If False, use a numpy random Generator, which is
+        faster but gives a different set of downtimes for the same seed. Default True.
     """
 
     MINOR_EVENT = {'P': 0.0137, 'length': 1, 'level': "minor event"}
@@ -30,44 +34,16 @@ class UnscheduledDowntimeData(object):
     MAJOR_EVENT = {'P': 0.00137, 'length': 7, 'level': "major event"}
     CATASTROPHIC_EVENT = {'P': 0.000274, 'length': 14, 'level': "catastrophic event"}
 
-    def __init__(self, start_time, seed=1516231120, start_of_night_offset=-0.34, survey_length=3650*2):
+    __slots__ = ('seed', 'survey_length', 'legacy_rng')
+
+    def __init__(self, start_time, seed=1516231120, start_of_night_offset=-0.34, survey_length=3650*2,
+                 legacy_rng=True):
         self.seed = seed
         self.survey_length = survey_length
-        year_start = start_time.datetime.year
-        self.night0 = Time('%d-01-01' % year_start, format='isot', scale='tai') + start_of_night_offset
-
-        # Scheduled downtime data is a np.ndarray of start / end / activity for each scheduled downtime.
-        self.downtime = None
+        self.legacy_rng = legacy_rng
+        super().__init__(start_time, start_of_night_offset)
         self.make_data()
 
-    def __call__(self):
-        """Return the array of unscheduled downtimes.
-
-        Parameters
-        ----------
-        time : astropy.time.Time
-            Time in the simulation for which to find the current downtime.
-
-        Returns
-        -------
-        np.ndarray
-            The array of all unscheduled downtimes, with keys for 'start', 'end', 'activity',
-            corresponding to astropy.time.Time, astropy.time.Time, and str.
-        """
-        return self.downtime
-
-    def _downtimeStatus(self, time):
-        """Look behind the scenes at the downtime status/next values
-        """
-        next_start = self.downtime['start'].searchsorted(time, side='right')
-        next_end = self.downtime['end'].searchsorted(time, side='right')
-        if next_start > next_end:
-            current = self.downtime[next_end]
-        else:
-            current = None
-        future = self.downtime[next_start:]
-        return current, future
-
     def make_data(self):
         """Configure the set of unscheduled downtimes.
 
@@ -85,54 +61,78 @@ class UnscheduledDowntimeData(object):
         catastrophic event
             14 nights = 1/3650 days e.g. replace a raft
         """
-        random.seed(self.seed)
+        if self.legacy_rng:
+            random.seed(self.seed)
+            rng = random
+        else:
+            rng = np.random.default_rng(self.seed)
+        self._set_downtime(*self._draw_events(rng, self.survey_length))
+
+    @classmethod
+    def _draw_events(cls, rng, survey_length):
+        """Draw the unscheduled downtime events as nights relative to the start of the simulation.
 
-        starts = []
-        ends = []
+        Parameters
+        ----------
+        rng : random.Random, module or np.random.Generator
+            The (already seeded) random number generator. The python random module (or a
+            random.Random) is stepped night by night, as in earlier versions; a numpy Generator
+            draws all nights at once.
+        survey_length : int
+            The number of nights in the total survey.
+
+        Returns
+        -------
+        np.ndarray, np.ndarray, list of str
+            The night (from night0) each downtime starts, its length (days) and its level.
+        """
+        events = (cls.CATASTROPHIC_EVENT, cls.MAJOR_EVENT, cls.INTERMEDIATE_EVENT, cls.MINOR_EVENT)
+        if isinstance(rng, np.random.Generator):
+            return cls._draw_events_vectorized(rng, survey_length, events)
+        nights = []
+        lengths = []
         acts = []
         night = 0
-        while night < self.survey_length:
-            prob = random.random()
-            if prob < self.CATASTROPHIC_EVENT['P']:
-                start_night = self.night0 + TimeDelta(night, format='jd')
-                starts.append(start_night)
-                end_night = start_night + TimeDelta(self.CATASTROPHIC_EVENT['length'], format='jd')
-                ends.append(end_night)
-                acts.append(self.CATASTROPHIC_EVENT['level'])
-                night += self.CATASTROPHIC_EVENT['length'] + 1
-                continue
+        while night < survey_length:
+            for event in events:
+                if rng.random() < event['P']:
+                    nights.append(night)
+                    lengths.append(event['length'])
+                    acts.append(event['level'])
+                    night += event['length'] + 1
+                    # Only a minor event is followed by an extra night of skipping.
+                    if event is cls.MINOR_EVENT:
+                        night += 1
+                    break
             else:
-                prob = random.random()
-                if prob < self.MAJOR_EVENT['P']:
-                    start_night = self.night0 + TimeDelta(night, format='jd')
-                    starts.append(start_night)
-                    end_night = start_night + TimeDelta(self.MAJOR_EVENT['length'], format='jd')
-                    ends.append(end_night)
-                    acts.append(self.MAJOR_EVENT['level'])
-                    night += self.MAJOR_EVENT['length'] + 1
-                    continue
-                else:
-                    prob = random.random()
-                    if prob < self.INTERMEDIATE_EVENT['P']:
-                        start_night = self.night0 + TimeDelta(night, format='jd')
-                        starts.append(start_night)
-                        end_night = start_night + TimeDelta(self.INTERMEDIATE_EVENT['length'], format='jd')
-                        ends.append(end_night)
-                        acts.append(self.INTERMEDIATE_EVENT['level'])
-                        night += self.INTERMEDIATE_EVENT['length'] + 1
-                        continue
-                    else:
-                        prob = random.random()
-                        if prob < self.MINOR_EVENT['P']:
-                            start_night = self.night0 + TimeDelta(night, format='jd')
-                            starts.append(start_night)
-                            end_night = start_night + TimeDelta(self.MINOR_EVENT['length'], format='jd')
-                            ends.append(end_night)
-                            acts.append(self.MINOR_EVENT['level'])
-                            night += self.MINOR_EVENT['length'] + 1
-            night += 1
-        self.downtime = np.array(list(zip(starts, ends, acts)),
-                                 dtype=[('start', 'O'), ('end', 'O'), ('activity', 'O')])
+                night += 1
+        return np.array(nights, dtype=int), np.array(lengths, dtype=int), acts
+
+    @classmethod
+    def _draw_events_vectorized(cls, rng, survey_length, events):
+        """Draw the unscheduled downtime events with a numpy Generator (see _draw_events).
+
+        The event type is drawn for every night at once; only the nights with an event are
+        then stepped through, skipping those which fall within a previous downtime.
+        """
+        probs = np.array([event['P'] for event in events])
+        hits = rng.random((max(survey_length, 0), len(events))) < probs
+        kinds = hits.argmax(axis=1)
+        nights = []
+        lengths = []
+        acts = []
+        night = 0
+        for candidate in np.flatnonzero(hits.any(axis=1)):
+            if candidate < night:
+                continue
+            event = events[kinds[candidate]]
+            nights.append(candidate)
+            lengths.append(event['length'])
+            acts.append(event['level'])
+            night = candidate + event['length'] + 1
+            if event is cls.MINOR_EVENT:
+                night += 1
+        return np.array(nights, dtype=int), np.array(lengths, dtype=int), acts
 
     def config_info(self):
         """Report information about configuration of this data.
@@ -146,18 +146,7 @@ class UnscheduledDowntimeData(object):
         config_info['Survey end'] = (self.night0 + TimeDelta(self.survey_length)).isot
         config_info['Total unscheduled downtime (days)'] = self.total_downtime()
         config_info['Random seed'] = self.seed
+        config_info['Legacy RNG'] = self.legacy_rng
+        config_info['Memory footprint (bytes)'] = self.nbytes
         config_info['Unscheduled Downtimes'] = self.downtime
         return config_info
-
-    def total_downtime(self):
-        """Return total downtime (in days).
-
-        Returns
-        -------
-        int
-            Total number of downtime days.
-        """
-        total = 0
-        for td in (self.downtime['end'] - self.downtime['start']):
-            total += td.jd
-        return total
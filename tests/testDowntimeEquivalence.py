@@ -0,0 +1,279 @@
+import os
+import random
+import sqlite3
+import unittest
+import numpy as np
+from astropy.time import Time, TimeDelta
+from lsst.utils import getPackageDir
+import lsst.utils.tests
+from lsst.utils.tests import getTempFilePath
+
+from lsst.sims.downtimeModel import DowntimeModel, DowntimeModelConfig, DowntimeSweep
+from lsst.sims.downtimeModel import ScheduledDowntimeData, UnscheduledDowntimeData
+
+
+# Number of randomized cases for each differential test.
+N_CASES = 25
+
+
+# The unscheduled downtime event definitions of the original UnscheduledDowntimeData.
+MINOR_EVENT = {'P': 0.0137, 'length': 1, 'level': "minor event"}
+INTERMEDIATE_EVENT = {'P': 0.00548, 'length': 3, 'level': "intermediate event"}
+MAJOR_EVENT = {'P': 0.00137, 'length': 7, 'level': "major event"}
+CATASTROPHIC_EVENT = {'P': 0.000274, 'length': 14, 'level': "catastrophic event"}
+
+
+def legacy_read_data(night0, scheduled_downtime_db):
+    """Copy of the original (object array) ScheduledDowntimeData.read_data."""
+    # Read from database.
+    starts = []
+    ends = []
+    acts = []
+    with sqlite3.connect(scheduled_downtime_db) as conn:
+        cur = conn.cursor()
+        cur.execute("select * from Downtime;")
+        for row in cur:
+            start_night = int(row[0])
+            start_night = night0 + TimeDelta(start_night, format='jd')
+            n_down = int(row[1])
+            end_night = start_night + TimeDelta(n_down)
+            activity = row[2]
+            starts.append(start_night)
+            ends.append(end_night)
+            acts.append(activity)
+        cur.close()
+    return np.array(list(zip(starts, ends, acts)),
+                    dtype=[('start', 'O'), ('end', 'O'), ('activity', 'O')])
+
+
+def legacy_make_data(night0, seed, survey_length):
+    """Copy of the original (object array) UnscheduledDowntimeData.make_data."""
+    random.seed(seed)
+
+    starts = []
+    ends = []
+    acts = []
+    night = 0
+    while night < survey_length:
+        prob = random.random()
+        if prob < CATASTROPHIC_EVENT['P']:
+            start_night = night0 + TimeDelta(night, format='jd')
+            starts.append(start_night)
+            end_night = start_night + TimeDelta(CATASTROPHIC_EVENT['length'], format='jd')
+            ends.append(end_night)
+            acts.append(CATASTROPHIC_EVENT['level'])
+            night += CATASTROPHIC_EVENT['length'] + 1
+            continue
+        else:
+            prob = random.random()
+            if prob < MAJOR_EVENT['P']:
+                start_night = night0 + TimeDelta(night, format='jd')
+                starts.append(start_night)
+                end_night = start_night + TimeDelta(MAJOR_EVENT['length'], format='jd')
+                ends.append(end_night)
+                acts.append(MAJOR_EVENT['level'])
+                night += MAJOR_EVENT['length'] + 1
+                continue
+            else:
+                prob = random.random()
+                if prob < INTERMEDIATE_EVENT['P']:
+                    start_night = night0 + TimeDelta(night, format='jd')
+                    starts.append(start_night)
+                    end_night = start_night + TimeDelta(INTERMEDIATE_EVENT['length'], format='jd')
+                    ends.append(end_night)
+                    acts.append(INTERMEDIATE_EVENT['level'])
+                    night += INTERMEDIATE_EVENT['length'] + 1
+                    continue
+                else:
+                    prob = random.random()
+                    if prob < MINOR_EVENT['P']:
+                        start_night = night0 + TimeDelta(night, format='jd')
+                        starts.append(start_night)
+                        end_night = start_night + TimeDelta(MINOR_EVENT['length'], format='jd')
+                        ends.append(end_night)
+                        acts.append(MINOR_EVENT['level'])
+                        night += MINOR_EVENT['length'] + 1
+        night += 1
+    return np.array(list(zip(starts, ends, acts)),
+                    dtype=[('start', 'O'), ('end', 'O'), ('activity', 'O')])
+
+
+def write_calendar(db, rng, n_rows):
+    """Write a random (non-overlapping) scheduled downtime calendar to db."""
+    durations = rng.randint(1, 15, size=n_rows)
+    gaps = rng.randint(1, 400, size=n_rows)
+    nights = np.cumsum(gaps + np.concatenate([[0], durations[:-1]]))
+    with sqlite3.connect(db) as conn:
+        cur = conn.cursor()
+        cur.execute("DROP TABLE IF EXISTS Downtime")
+        cur.execute("CREATE TABLE Downtime(night INTEGER PRIMARY KEY, duration INTEGER, activity TEXT)")
+        for night, duration in zip(nights, durations):
+            cur.execute("INSERT INTO Downtime VALUES(?, ?, ?)",
+                        (int(night), int(duration), "activity %d" % rng.randint(5)))
+        cur.close()
+
+
+class DowntimeEquivalenceTest(unittest.TestCase):
+    """Compare the downtime data and model against the original object array implementation."""
+
+    def setUp(self):
+        self.rng = np.random.RandomState(42)
+        self.downtime_db = os.path.join(getPackageDir('sims_downtimeModel'), 'data', 'scheduled_downtime.db')
+
+    def random_start(self):
+        mjd = self.rng.uniform(58849, 62502)
+        return Time(mjd, format='mjd', scale='tai'), self.rng.uniform(-0.5, 0.5)
+
+    def assertTimesIdentical(self, t1, t2):
+        if t1 is None or t2 is None:
+            self.assertIs(t1, t2)
+        else:
+            self.assertEqual(t1.jd1, t2.jd1)
+            self.assertEqual(t1.jd2, t2.jd2)
+
+    def assertDowntimesIdentical(self, downtime, expected):
+        self.assertEqual(len(downtime), len(expected))
+        self.assertEqual(list(downtime['activity']), list(expected['activity']))
+        for row, expected_row in zip(downtime, expected):
+            self.assertTimesIdentical(row['start'], expected_row['start'])
+            self.assertTimesIdentical(row['end'], expected_row['end'])
+
+    def test_read_data(self):
+        for i in range(N_CASES):
+            start_time, offset = self.random_start()
+            with getTempFilePath('.downtime_%d.db' % i) as tmpdb:
+                write_calendar(tmpdb, self.rng, self.rng.randint(0, 40))
+                for db in (self.downtime_db, tmpdb):
+                    downtimeData = ScheduledDowntimeData(start_time, scheduled_downtime_db=db,
+                                                         start_of_night_offset=offset)
+                    expected = legacy_read_data(downtimeData.night0, db)
+                    self.assertDowntimesIdentical(downtimeData.downtime, expected)
+
+    def test_make_data(self):
+        for i in range(N_CASES):
+            start_time, offset = self.random_start()
+            seed = int(self.rng.randint(0, 2**31))
+            survey_length = int(self.rng.randint(0, 3650))
+            downtimeData = UnscheduledDowntimeData(start_time, seed=seed, start_of_night_offset=offset,
+                                                   survey_length=survey_length)
+            state = random.getstate()
+            expected = legacy_make_data(downtimeData.night0, seed, survey_length)
+            self.assertDowntimesIdentical(downtimeData.downtime, expected)
+            # Both consume the same draws from the global random state.
+            self.assertEqual(state, random.getstate())
+
+    def test_default_make_data(self):
+        t = Time('2020-01-01', format='isot', scale='tai')
+        downtimeData = UnscheduledDowntimeData(t)
+        expected = legacy_make_data(downtimeData.night0, downtimeData.seed, downtimeData.survey_length)
+        self.assertDowntimesIdentical(downtimeData.downtime, expected)
+
+    def test_numpy_rng(self):
+        t = Time('2020-01-01', format='isot', scale='tai')
+        downtimeData = UnscheduledDowntimeData(t, seed=3, legacy_rng=False)
+        repeat = UnscheduledDowntimeData(t, seed=3, legacy_rng=False)
+        self.assertDowntimesIdentical(downtimeData.downtime, repeat.downtime)
+        self.assertFalse(downtimeData.config_info()['Legacy RNG'])
+        # Downtimes are ordered, do not overlap and follow the same event rules.
+        nights = np.array([(s - downtimeData.night0).jd for s in downtimeData.downtime['start']])
+        lengths = np.array([(e - s).jd for s, e in zip(downtimeData.downtime['start'],
+                                                        downtimeData.downtime['end'])])
+        self.assertTrue(np.all(np.diff(nights) > lengths[:-1]))
+        self.assertTrue(np.all(nights < downtimeData.survey_length))
+        events = dict((e['level'], e['length']) for e in (UnscheduledDowntimeData.MINOR_EVENT,
+                                                           UnscheduledDowntimeData.INTERMEDIATE_EVENT,
+                                                           UnscheduledDowntimeData.MAJOR_EVENT,
+                                                           UnscheduledDowntimeData.CATASTROPHIC_EVENT))
+        for length, activity in zip(lengths, downtimeData.downtime['activity']):
+            self.assertAlmostEqual(length, events[activity])
+        # Expect roughly the same number of downtimes as with the legacy RNG.
+        legacy = UnscheduledDowntimeData(t, seed=3)
+        self.assertLess(abs(len(downtimeData.downtime) - len(legacy.downtime)), 0.3 * len(legacy.downtime))
+
+    def test_call(self):
+        config = DowntimeModelConfig()
+        downtimeModel = DowntimeModel(config)
+        time_key = downtimeModel.target_requirements[0]
+        for i in range(N_CASES):
+            start_time, offset = self.random_start()
+            seed = int(self.rng.randint(0, 2**31))
+            survey_length = int(self.rng.randint(0, 3650))
+            with getTempFilePath('.downtime_call_%d.db' % i) as tmpdb:
+                write_calendar(tmpdb, self.rng, self.rng.randint(1, 40))
+                sched = ScheduledDowntimeData(start_time, scheduled_downtime_db=tmpdb,
+                                              start_of_night_offset=offset)
+                legacy_sched = legacy_read_data(sched.night0, tmpdb)
+            unsched = UnscheduledDowntimeData(start_time, seed=seed, start_of_night_offset=offset,
+                                              survey_length=survey_length)
+            efdData = {config.efd_columns[0]: sched(), config.efd_columns[1]: unsched()}
+            legacyData = {config.efd_columns[0]: legacy_sched,
+                          config.efd_columns[1]: legacy_make_data(unsched.night0, seed, survey_length)}
+            # Random times, plus the edges of the downtimes, before the last scheduled downtime
+            # (after which there is no next downtime to report).
+            last_start = legacy_sched[-1]['start']
+            times = list(sched.night0 + TimeDelta(self.rng.uniform(0, (last_start - sched.night0).jd,
+                                                                   size=20), format='jd'))
+            for downtime in legacyData.values():
+                times.extend(downtime['start'])
+                times.extend(downtime['end'])
+            for t in times:
+                if t >= last_start:
+                    continue
+                status = downtimeModel(efdData, {time_key: t})
+                expected = downtimeModel(legacyData, {time_key: t})
+                self.assertEqual(status['status'], expected['status'])
+                self.assertTimesIdentical(status['end'], expected['end'])
+                self.assertTimesIdentical(status['next'], expected['next'])
+
+    def test_downtime_status(self):
+        for i in range(N_CASES):
+            start_time, offset = self.random_start()
+            seed = int(self.rng.randint(0, 2**31))
+            downtimeData = UnscheduledDowntimeData(start_time, seed=seed, start_of_night_offset=offset,
+                                                   survey_length=int(self.rng.randint(1, 3650)))
+            expected = legacy_make_data(downtimeData.night0, seed, downtimeData.survey_length)
+            times = list(downtimeData.night0 + TimeDelta(self.rng.uniform(-10, 3700, size=20), format='jd'))
+            times.extend(expected['start'])
+            times.extend(expected['end'])
+            # Check both without and with the np.ndarray of downtimes kept.
+            for kept in (False, True):
+                if kept:
+                    downtimeData.downtime
+                for t in times:
+                    current, future = downtimeData._downtimeStatus(t)
+                    next_start = expected['start'].searchsorted(t, side='right')
+                    next_end = expected['end'].searchsorted(t, side='right')
+                    if next_start > next_end:
+                        self.assertDowntimesIdentical(np.array([current]), expected[[next_end]])
+                    else:
+                        self.assertIsNone(current)
+                    self.assertDowntimesIdentical(future, expected[next_start:])
+
+    def test_sweep(self):
+        for legacy_rng in (True, False):
+            for i in range(N_CASES):
+                start_time, offset = self.random_start()
+                seed = int(self.rng.randint(0, 2**31))
+                survey_length = int(self.rng.randint(1, 3650))
+                sweep = DowntimeSweep(survey_length=survey_length, legacy_rng=legacy_rng)
+                night0 = sweep.night0_grid(start_time, offset)
+                unsched = UnscheduledDowntimeData(start_time, seed=seed, start_of_night_offset=offset,
+                                                  survey_length=survey_length, legacy_rng=legacy_rng)
+                if legacy_rng:
+                    expected = legacy_make_data(unsched.night0, seed, survey_length)
+                else:
+                    expected = unsched.downtime
+                starts, ends = sweep.unscheduled(night0, seed=seed)
+                np.testing.assert_allclose(starts[0, 0], [s.mjd for s in expected['start']])
+                np.testing.assert_allclose(ends[0, 0], [e.mjd for e in expected['end']])
+
+
+class TestMemory(lsst.utils.tests.MemoryTestCase):
+    pass
+
+def setup_module(module):
+    lsst.utils.tests.init()
+
+if __name__ == "__main__":
+    lsst.utils.tests.init()
+    unittest.main()
@@ -0,0 +1,119 @@
+import unittest
+import numpy as np
+from astropy.time import Time
+import lsst.utils.tests
+
+from lsst.sims.downtimeModel import DowntimeSweep, ScheduledDowntimeData, UnscheduledDowntimeData
+
+
+class DowntimeSweepTest(unittest.TestCase):
+
+    def setUp(self):
+        self.th = Time(['2020-01-01', '2022-06-15'], format='isot', scale='tai')
+        self.offsets = np.array([-0.34, 0])
+        self.seeds = [1516231120, 3]
+        self.survey_length = 3650
+
+    def test_night0(self):
+        sweep = DowntimeSweep(survey_length=self.survey_length)
+        night0 = sweep.night0_grid(self.th, self.offsets)
+        self.assertEqual(night0.shape, (2, 2))
+        for i, t in enumerate(self.th):
+            for j, offset in enumerate(self.offsets):
+                downtimeData = ScheduledDowntimeData(t, start_of_night_offset=offset)
+                self.assertAlmostEqual(night0[i, j], downtimeData.night0.mjd)
+
+    def test_rebase(self):
+        sweep = DowntimeSweep(survey_length=self.survey_length)
+        t = self.th[1]
+        night0 = sweep.night0_grid(t, self.offsets[0])
+        sched = ScheduledDowntimeData(t, start_of_night_offset=self.offsets[0])
+        starts, ends = sweep.scheduled(night0)
+        self.assertEqual(starts.shape, (1, 1, len(sched.downtime)))
+        np.testing.assert_allclose(starts[0, 0], [s.mjd for s in sched.downtime['start']])
+        np.testing.assert_allclose(ends[0, 0], [e.mjd for e in sched.downtime['end']])
+        unsched = UnscheduledDowntimeData(t, seed=3, start_of_night_offset=self.offsets[0],
+                                          survey_length=self.survey_length)
+        starts, ends = sweep.unscheduled(night0, seed=3)
+        np.testing.assert_allclose(starts[0, 0], [s.mjd for s in unsched.downtime['start']])
+        np.testing.assert_allclose(ends[0, 0], [e.mjd for e in unsched.downtime['end']])
+
+    def test_call(self):
+        sweep = DowntimeSweep(survey_length=self.survey_length)
+        metrics = sweep(self.th, self.offsets, seeds=self.seeds)
+        for k in ('scheduled_downtime', 'unscheduled_downtime', 'total_downtime', 'available_fraction'):
+            self.assertEqual(metrics[k].shape, (2, 2, 2))
+        # Compare against rebuilding the downtime data for each combination.
+        for i, t in enumerate(self.th):
+            window_start = t.mjd
+            window_end = window_start + self.survey_length
+            for j, offset in enumerate(self.offsets):
+                sched = ScheduledDowntimeData(t, start_of_night_offset=offset)
+                # The unscheduled downtimes are drawn from night0 to the end of the survey window.
+                draw_length = int(np.ceil(window_end - sched.night0.mjd))
+                for k, seed in enumerate(self.seeds):
+                    unsched = UnscheduledDowntimeData(t, seed=seed, start_of_night_offset=offset,
+                                                      survey_length=draw_length)
+                    for key, downtimeData in (('scheduled_downtime', sched),
+                                              ('unscheduled_downtime', unsched)):
+                        total = 0
+                        for start, end in zip(downtimeData.downtime['start'], downtimeData.downtime['end']):
+                            total += max(0, min(end.mjd, window_end) - max(start.mjd, window_start))
+                        self.assertAlmostEqual(metrics[key][i, j, k], total)
+        self.assertTrue(np.all(metrics['total_downtime'] <= metrics['scheduled_downtime'] +
+                               metrics['unscheduled_downtime']))
+        self.assertTrue(np.all(metrics['total_downtime'] >= metrics['scheduled_downtime']))
+        np.testing.assert_allclose(metrics['available_fraction'],
+                                   1 - metrics['total_downtime'] / self.survey_length)
+
+    def test_mid_year_start(self):
+        # A survey starting mid-year runs past survey_length nights from night0;
+        # unscheduled downtime is still expected towards the end of the survey.
+        t = Time('2022-12-01', format='isot', scale='tai')
+        sweep = DowntimeSweep(survey_length=self.survey_length)
+        metrics = sweep(t, self.offsets[0], seeds=self.seeds)
+        night0 = sweep.night0_grid(t, self.offsets[0])[0, 0]
+        self.assertGreater(t.mjd + self.survey_length, night0 + self.survey_length + 300)
+        for k, seed in enumerate(self.seeds):
+            unsched = UnscheduledDowntimeData(t, seed=seed, start_of_night_offset=self.offsets[0],
+                                              survey_length=self.survey_length + 366)
+            starts = np.array([start.mjd for start in unsched.downtime['start']])
+            self.assertTrue(np.any(starts > night0 + self.survey_length))
+            total = 0
+            for start, end in zip(unsched.downtime['start'], unsched.downtime['end']):
+                total += max(0, min(end.mjd, t.mjd + self.survey_length) - max(start.mjd, t.mjd))
+            self.assertAlmostEqual(metrics['unscheduled_downtime'][0, 0, k], total)
+        # The unscheduled downtimes within survey_length nights of night0 are unchanged.
+        unsched = UnscheduledDowntimeData(t, seed=3, start_of_night_offset=self.offsets[0],
+                                          survey_length=self.survey_length)
+        starts, ends = sweep.unscheduled(night0, seed=3)
+        np.testing.assert_allclose(starts, [s.mjd for s in unsched.downtime['start']])
+
+    def test_survey_length(self):
+        self.assertRaises(RuntimeError, DowntimeSweep, survey_length=0)
+        self.assertRaises(RuntimeError, DowntimeSweep, survey_length=-1)
+
+    def test_no_seeds(self):
+        sweep = DowntimeSweep(survey_length=self.survey_length)
+        metrics = sweep(self.th, self.offsets, seeds=[])
+        for k in metrics:
+            self.assertEqual(metrics[k].shape, (2, 2, 0))
+
+    def test_processes(self):
+        sweep = DowntimeSweep(survey_length=self.survey_length)
+        metrics = sweep(self.th, self.offsets, seeds=self.seeds)
+        pooled = DowntimeSweep(survey_length=self.survey_length)
+        metrics_pool = pooled(self.th, self.offsets, seeds=self.seeds, processes=2)
+        for k in metrics:
+            np.testing.assert_array_equal(metrics[k], metrics_pool[k])
+
+
+class TestMemory(lsst.utils.tests.MemoryTestCase):
+    pass
+
+def setup_module(module):
+    lsst.utils.tests.init()
+
+if __name__ == "__main__":
+    lsst.utils.tests.init()
+    unittest.main()
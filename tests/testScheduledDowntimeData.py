@@ -61,6 +61,32 @@ class ScheduledDowntimeDataTest(unittest.TestCase):
         downtimes = downtimeData()
         self.assertEqual(downtimes['activity'][4], 'recoat mirror')
 
+    def test_memory_footprint(self):
+        downtimeData = ScheduledDowntimeData(self.th, start_of_night_offset=self.startofnight)
+        other = ScheduledDowntimeData(self.th, start_of_night_offset=self.startofnight)
+        self.assertFalse(hasattr(downtimeData, '__dict__'))
+        # night0 and the (interned) activity labels are shared between instances.
+        self.assertIs(downtimeData.night0, other.night0)
+        self.assertFalse(downtimeData.night0.writeable)
+        self.assertEqual(downtimeData.total_downtime(), 280)
+        self.assertGreater(downtimeData.nbytes, 0)
+        self.assertLess(downtimeData.nbytes, 2000)
+        compact_nbytes = downtimeData.nbytes
+        # The np.ndarray of downtimes is built once, kept (with any changes) and can be released.
+        downtimes = downtimeData()
+        self.assertIs(downtimeData(), downtimes)
+        self.assertIs(downtimes['activity'][4], other.downtime['activity'][4])
+        self.assertGreater(downtimeData.nbytes, compact_nbytes)
+        downtimes['activity'][4] = 'changed'
+        self.assertEqual(downtimeData.downtime['activity'][4], 'changed')
+        downtimeData.release_downtime()
+        self.assertEqual(downtimeData.nbytes, compact_nbytes)
+        self.assertEqual(downtimeData.downtime['activity'][4], 'recoat mirror')
+        # The starts and ends columns match the np.ndarray of downtimes.
+        for start, end, row in zip(downtimeData.starts, downtimeData.ends, downtimeData.downtime):
+            self.assertEqual(start, row['start'])
+            self.assertEqual(end, row['end'])
+
 
 class TestMemory(lsst.utils.tests.MemoryTestCase):
     pass
@@ -48,6 +48,34 @@ class UnscheduledDowntimeDataTest(unittest.TestCase):
         downtimes = downtimeData()
         self.assertEqual(downtimes['activity'][2], 'major event')
 
+    def test_memory_footprint(self):
+        downtimeData = UnscheduledDowntimeData(self.th, start_of_night_offset=self.startofnight,
+                                               survey_length=self.survey_length, seed=self.seed)
+        other = UnscheduledDowntimeData(self.th, start_of_night_offset=self.startofnight,
+                                        survey_length=self.survey_length, seed=3)
+        self.assertFalse(hasattr(downtimeData, '__dict__'))
+        # night0 and the (interned) activity labels are shared between instances.
+        self.assertIs(downtimeData.night0, other.night0)
+        self.assertFalse(downtimeData.night0.writeable)
+        self.assertGreater(downtimeData.nbytes, 0)
+        self.assertLess(downtimeData.nbytes, 4000)
+        compact_nbytes = downtimeData.nbytes
+        # The np.ndarray of downtimes is built once, kept (with any changes) and can be released.
+        downtimes = downtimeData()
+        self.assertIs(downtimeData(), downtimes)
+        self.assertIs(downtimes['activity'][0], other.downtime['activity'][0])
+        self.assertGreater(downtimeData.nbytes, compact_nbytes)
+        downtimes['activity'][2] = 'changed'
+        self.assertEqual(downtimeData.downtime['activity'][2], 'changed')
+        downtimeData.release_downtime()
+        self.assertEqual(downtimeData.nbytes, compact_nbytes)
+        self.assertEqual(downtimeData.downtime['activity'][2], 'major event')
+        # The starts and ends columns match the np.ndarray of downtimes.
+        for start, end, row in zip(downtimeData.starts, downtimeData.ends, downtimeData.downtime):
+            self.assertEqual(start, row['start'])
+            self.assertEqual(end, row['end'])
+        self.assertEqual(downtimeData.config_info()['Memory footprint (bytes)'], downtimeData.nbytes)
+
 
 class TestMemory(lsst.utils.tests.MemoryTestCase):
     pass